@@ -1,217 +1,623 @@
+from __future__ import annotations
+
 import os
-import time
+import re
 import json
-from typing import Dict, List, Any, Optional
+import asyncio
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, NamedTuple, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from playwright.sync_api import sync_playwright, Page, Browser
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+if TYPE_CHECKING:
+    # Playwright is imported lazily in _ensure_browser so the parsing-only
+    # path (LLMClient) doesn't pay the driver import at module load
+    from playwright.async_api import Page, Browser, BrowserContext
+
 logger = logging.getLogger(__name__)
 
+# Single precompiled pattern: one pass over the instruction instead of
+# repeated lower()/split() scans
+_INSTRUCTION_RE = re.compile(
+    r"to\s+(?P<to>[^\s]+@[^\s]+)"
+    r"|about\s+(?P<subj>[^.]+?)(?=\s+using|\.|$)"
+    r"|\b(?P<svc>gmail|outlook)\b",
+    re.IGNORECASE,
+)
+
+# Matches ${key} placeholders in action value templates
+_PLACEHOLDER_RE = re.compile(r"\$\{(\w+)\}")
+
+# Persisted cookies/localStorage so auth is paid once, not per run
+_AUTH_STATE_PATH = "auth.json"
+
+# Per-email wall-time budget: one hung task shouldn't drag total throughput
+_EMAIL_TIMEOUT = 30.0
+
+# Lean-mode Chromium flags: turn off components that cost CPU/RAM but never
+# help automated form fills (GPU compositing, extensions, throttling, images)
+_CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-features=TranslateUI,BlinkGenPropertyTrees",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Resource types and analytics hosts the agent never observes; blocking them
+# composes with imagesEnabled=false for defense in depth
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+_ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "clarity.ms",
+)
+
+# Fills every [selector, value] pair in one page-side pass, dispatching an
+# input event so framework listeners still fire
+_FILL_ALL_JS = """(pairs) => {
+    for (const [selector, value] of pairs) {
+        const el = document.querySelector(selector);
+        el.focus();
+        el.value = value;
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+    }
+}"""
+
+# Same fill pass, but over a pre-resolved node array (this) by action index
+_FILL_BY_INDEX_JS = """function(pairs) {
+    for (const [i, value] of pairs) {
+        const el = this[i];
+        el.focus();
+        el.value = value;
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+    }
+}"""
+
+_CLICK_BY_INDEX_JS = "function(i) { this[i].click(); }"
+
+class Action(NamedTuple):
+    """One browser action: fixed-layout record, cheaper than a per-action dict"""
+    kind: str
+    selector: str
+    description: str
+    value: Optional[str] = None
+
+def _freeze_actions(actions: List[Dict]) -> Tuple[Action, ...]:
+    """Freeze an action list into reusable read-only records
+
+    Converts ${key} placeholders to {key} format_map templates once at module
+    load so the hot path does no per-call allocation or regex work.
+    """
+    frozen = []
+    for action in actions:
+        value = action.get("value")
+        if value is not None:
+            value = _PLACEHOLDER_RE.sub(r"{\1}", value)
+        frozen.append(Action(action["action"], action["selector"],
+                             action["description"], value))
+    return tuple(frozen)
+
+# Fixed per-service action sequences, specialized at module load: the mock
+# UI analysis is a pure function of the target service
+_GMAIL_ACTIONS = _freeze_actions([
+    {"action": "click", "selector": "div[role='button'][gh='cm']", "description": "Click compose button"},
+    {"action": "fill", "selector": "input[aria-label='To']", "value": "${recipient}", "description": "Fill recipient field"},
+    {"action": "fill", "selector": "input[aria-label='Subject']", "value": "${subject}", "description": "Fill subject field"},
+    {"action": "fill", "selector": "div[aria-label='Message Body']", "value": "${body}", "description": "Fill body field"},
+    {"action": "click", "selector": "div[role='button'][aria-label*='Send']", "description": "Click send button"}
+])
+
+_OUTLOOK_ACTIONS = _freeze_actions([
+    {"action": "click", "selector": "button[aria-label='New message']", "description": "Click new message button"},
+    {"action": "fill", "selector": "input[aria-label='To']", "value": "${recipient}", "description": "Fill recipient field"},
+    {"action": "fill", "selector": "input[aria-label='Add a subject']", "value": "${subject}", "description": "Fill subject field"},
+    {"action": "fill", "selector": "div[aria-label='Message body']", "value": "${body}", "description": "Fill body field"},
+    {"action": "click", "selector": "button[aria-label='Send']", "description": "Click send button"}
+])
+
 class EmailService(Enum):
     GMAIL = "gmail"
     OUTLOOK = "outlook"
 
-@dataclass
+@dataclass(frozen=True)
 class EmailInstruction:
     recipient: str
     subject: str
     body: str
     service: EmailService
 
+@lru_cache(maxsize=8)
+def _goal_actions(goal: str) -> Tuple[Action, ...]:
+    """Map a goal string to its action sequence, lowering each goal once
+
+    Only a couple of distinct goal strings ever occur, so the cache removes
+    the per-email lower() allocation and substring scan entirely.
+    """
+    return _GMAIL_ACTIONS if "gmail" in goal.lower() else _OUTLOOK_ACTIONS
+
+@lru_cache(maxsize=128)
+def _parse_instruction(instruction: str) -> EmailInstruction:
+    """Single-pass instruction scan, memoized per unique instruction string
+
+    The precompiled regex already runs the scan as one C-level DFA pass; the
+    cache means a repeated instruction costs only a dict lookup.
+    """
+    recipient = "test@example.com"  # Default
+    subject = "Automated Email"
+    body = "This is an automated email sent by the Humaein AI agent."
+    service = EmailService.GMAIL
+
+    for m in _INSTRUCTION_RE.finditer(instruction):
+        if m.group("to"):
+            recipient = m.group("to").lower()
+        elif m.group("subj"):
+            subject = m.group("subj").capitalize()
+        elif m.group("svc"):
+            service = EmailService(m.group("svc").lower())
+
+    return EmailInstruction(recipient, subject, body, service)
+
 class LLMClient:
     """Mock LLM client for instruction parsing and UI analysis"""
-    
+
+    # A real LLM backend would flip this to request page HTML for analysis;
+    # the mock's output is deterministic so the capture is skipped entirely
+    needs_html = False
+
     def parse_email_instruction(self, instruction: str) -> EmailInstruction:
         """Parse natural language instruction into structured email data"""
         # In a real implementation, this would call an actual LLM API
         # For this exercise, we'll use simple pattern matching
-        
+
         logger.info(f"Parsing instruction: {instruction}")
-        
+
         # Simple parsing logic - in reality, this would use proper NLP
-        recipient = "test@example.com"  # Default
-        subject = "Automated Email"
-        body = "This is an automated email sent by the Humaein AI agent."
-        service = EmailService.GMAIL
-        
-        # Extract recipient if mentioned
-        if "to " in instruction.lower():
-            parts = instruction.lower().split("to ")
-            if len(parts) > 1:
-                recipient_part = parts[1].split(" ")[0]
-                if "@" in recipient_part:
-                    recipient = recipient_part
-        
-        # Extract subject if mentioned
-        if "about " in instruction.lower():
-            parts = instruction.lower().split("about ")
-            if len(parts) > 1:
-                subject = parts[1].split(".")[0].capitalize()
-        
-        # Extract service preference if mentioned
-        if "gmail" in instruction.lower():
-            service = EmailService.GMAIL
-        elif "outlook" in instruction.lower():
-            service = EmailService.OUTLOOK
-        
-        return EmailInstruction(recipient, subject, body, service)
-    
-    def analyze_ui_and_generate_actions(self, html: str, goal: str) -> List[Dict]:
+        return _parse_instruction(instruction)
+
+    def analyze_ui_and_generate_actions(self, goal: str, html: Optional[str] = None) -> Tuple[Action, ...]:
         """Analyze UI and generate action sequence"""
         # In a real implementation, this would call an actual LLM API
         # For this exercise, we'll return predefined actions based on the goal
-        
+
         logger.info(f"Analyzing UI for goal: {goal}")
-        
-        if "gmail" in goal.lower():
-            return [
-                {"action": "click", "selector": "div[role='button'][gh='cm']", "description": "Click compose button"},
-                {"action": "fill", "selector": "input[aria-label='To']", "value": "${recipient}", "description": "Fill recipient field"},
-                {"action": "fill", "selector": "input[aria-label='Subject']", "value": "${subject}", "description": "Fill subject field"},
-                {"action": "fill", "selector": "div[aria-label='Message Body']", "value": "${body}", "description": "Fill body field"},
-                {"action": "click", "selector": "div[role='button'][aria-label*='Send']", "description": "Click send button"}
-            ]
-        else:  # outlook
-            return [
-                {"action": "click", "selector": "button[aria-label='New message']", "description": "Click new message button"},
-                {"action": "fill", "selector": "input[aria-label='To']", "value": "${recipient}", "description": "Fill recipient field"},
-                {"action": "fill", "selector": "input[aria-label='Add a subject']", "value": "${subject}", "description": "Fill subject field"},
-                {"action": "fill", "selector": "div[aria-label='Message body']", "value": "${body}", "description": "Fill body field"},
-                {"action": "click", "selector": "button[aria-label='Send']", "description": "Click send button"}
-            ]
+
+        # The mock output depends only on the service, so return the
+        # module-level frozen sequences instead of rebuilding dicts per call
+        return _goal_actions(goal)
 
 class WebAutomationAgent:
     """Generic web automation agent for email services"""
-    
-    def __init__(self):
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=False)
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+
+    # Browser is a process-wide singleton: Chromium startup (~500ms-2s) is
+    # paid once and amortized across every send_email call
+    _playwright = None
+    _browser: Optional[Browser] = None
+
+    # Per-step latency samples in ms, measured inside the page with
+    # performance.now() so time is attributed to the browser, not the client
+    _stats: Dict[str, List[float]] = defaultdict(list)
+
+    def __init__(self, fast_mode: bool = False):
         self.llm = LLMClient()
-        
-    def navigate_to_service(self, service: EmailService) -> None:
+        # fast_mode dispatches clicks as plain DOM events, skipping
+        # Playwright's actionability waits: faster, but no safety net
+        self.fast_mode = fast_mode
+
+    async def _measure(self, page: Page, name: str, coro):
+        """Await coro, recording its in-page duration under name"""
+        t0 = await page.evaluate("performance.now()")
+        result = await coro
+        t1 = await page.evaluate("performance.now()")
+        self._stats[name].append(t1 - t0)
+        return result
+
+    @classmethod
+    def _record_request(cls, request) -> None:
+        """requestfinished hook: capture per-network-request timing"""
+        timing = request.timing
+        if timing["responseEnd"] >= 0:
+            cls._stats["network:request"].append(timing["responseEnd"])
+
+    @classmethod
+    async def _ensure_browser(cls, headless: bool = True) -> Browser:
+        """Lazily start Playwright and launch the shared browser"""
+        if cls._browser is None:
+            from playwright.async_api import async_playwright
+
+            cls._playwright = await async_playwright().start()
+            cls._browser = await cls._playwright.chromium.launch(
+                headless=headless, args=_CHROMIUM_ARGS
+            )
+        return cls._browser
+
+    @classmethod
+    async def setup(cls, headless: bool = True, fast_mode: bool = False) -> "WebAutomationAgent":
+        """Create an agent backed by the shared browser instance
+
+        Pass headless=False to watch the browser while debugging.
+        """
+        agent = cls(fast_mode=fast_mode)
+        await cls._ensure_browser(headless=headless)
+        return agent
+
+    @staticmethod
+    async def _filter_request(route, request) -> None:
+        """Abort requests for resources the automation never uses"""
+        if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+            host in request.url for host in _ANALYTICS_HOSTS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def new_session(self) -> BrowserContext:
+        """Create an isolated browser context for one email task"""
+        # One browser, many contexts: each concurrent task gets its own
+        # cookie jar without paying browser startup cost
+        browser = await self._ensure_browser()
+        # Warm-start from persisted auth state when a previous run saved it
+        storage_state = _AUTH_STATE_PATH if os.path.exists(_AUTH_STATE_PATH) else None
+        context = await browser.new_context(storage_state=storage_state)
+        await context.route("**/*", self._filter_request)
+        return context
+
+    async def navigate_to_service(self, page: Page, service: EmailService) -> None:
         """Navigate to the email service"""
         if service == EmailService.GMAIL:
-            self.page.goto("https://mail.google.com")
+            await page.goto("https://mail.google.com")
             logger.info("Navigated to Gmail")
         else:  # Outlook
-            self.page.goto("https://outlook.live.com")
+            await page.goto("https://outlook.live.com")
             logger.info("Navigated to Outlook")
-        
-        # Wait for page to load
-        self.page.wait_for_timeout(3000)
-    
-    def mock_authentication(self, service: EmailService) -> None:
+
+        # Wait for the page to actually be ready instead of a fixed sleep,
+        # with a short capped fallback if the event never fires
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=5000)
+        except Exception:
+            await page.wait_for_timeout(500)
+
+    async def mock_authentication(self, page: Page, service: EmailService) -> None:
         """Mock authentication process"""
         # In a real implementation, this would handle actual authentication
+        if os.path.exists(_AUTH_STATE_PATH):
+            # Context was created from persisted state; nothing to do
+            logger.info(f"Reusing persisted auth state for {service.value}")
+            return
+
         logger.info(f"Mock authentication for {service.value}")
-        self.page.wait_for_timeout(2000)  # Simulate auth time
-    
-    def execute_actions(self, actions: List[Dict], data: Dict) -> None:
+        try:
+            await page.wait_for_url(re.compile(r"mail\.google|outlook"), timeout=2000)
+        except Exception:
+            await page.wait_for_timeout(500)
+
+        # Persist cookies/localStorage so later runs skip this step entirely
+        await page.context.storage_state(path=_AUTH_STATE_PATH)
+
+    async def _resolve(self, page: Page, selector: str, sel_cache: Dict[str, Any]):
+        """Resolve a selector to an element handle, caching repeat lookups"""
+        handle = sel_cache.get(selector)
+        if handle is None or not await handle.is_visible():
+            handle = await page.wait_for_selector(selector)
+            sel_cache[selector] = handle
+        return handle
+
+    async def _cdp_click(self, cdp, handle) -> None:
+        """Click an element via raw CDP mouse events"""
+        box = await handle.bounding_box()
+        x = box["x"] + box["width"] / 2
+        y = box["y"] + box["height"] / 2
+        for event_type in ("mousePressed", "mouseReleased"):
+            await cdp.send("Input.dispatchMouseEvent", {
+                "type": event_type, "x": x, "y": y,
+                "button": "left", "clickCount": 1
+            })
+
+    @staticmethod
+    def _check_js_result(result: Dict) -> Dict:
+        """Raise if a Runtime.evaluate/callFunctionOn response carries a JS error
+
+        A thrown page-side exception is a successful CDP response with
+        exceptionDetails set; surfacing it here keeps the per-action error
+        logging that page.evaluate gave us.
+        """
+        details = result.get("exceptionDetails")
+        if details:
+            description = details.get("exception", {}).get(
+                "description", details.get("text", "JavaScript error")
+            )
+            raise RuntimeError(f"Page-side script failed: {description}")
+        return result
+
+    async def _rpc_click(self, cdp, selector: str) -> None:
+        """Click via Runtime.evaluate on the persistent CDP session"""
+        self._check_js_result(await cdp.send("Runtime.evaluate", {
+            "expression": f"document.querySelector({json.dumps(selector)}).click()",
+            "returnByValue": False,
+        }))
+
+    async def _rpc_fill_all(self, cdp, pairs: List[List[str]]) -> None:
+        """Run the batched fill via Runtime.evaluate on the CDP session"""
+        self._check_js_result(await cdp.send("Runtime.evaluate", {
+            "expression": f"({_FILL_ALL_JS})({json.dumps(pairs)})",
+            "returnByValue": False,
+        }))
+
+    async def _resolve_all(self, cdp, selectors: List[str]) -> str:
+        """Resolve every selector in one page-side pass
+
+        Returns the remote objectId of the node array so later actions can
+        dispatch on it with Runtime.callFunctionOn: N DOM queries become one.
+        """
+        result = self._check_js_result(await cdp.send("Runtime.evaluate", {
+            "expression": (
+                f"(sels => sels.map(s => document.querySelector(s)))"
+                f"({json.dumps(selectors)})"
+            ),
+            "returnByValue": False,
+        }))
+        return result["result"]["objectId"]
+
+    async def _call_on_nodes(self, cdp, object_id: str, declaration: str,
+                             arguments: List[Dict]) -> None:
+        """Invoke declaration with the pre-resolved node array as this"""
+        self._check_js_result(await cdp.send("Runtime.callFunctionOn", {
+            "objectId": object_id,
+            "functionDeclaration": declaration,
+            "arguments": arguments,
+        }))
+
+    async def execute_actions(self, page: Page, cdp, actions: Tuple[Action, ...], data: Dict) -> None:
         """Execute the generated actions"""
-        for action in actions:
-            try:
-                action_type = action["action"]
-                selector = action["selector"]
-                description = action["description"]
-                
-                logger.info(f"Executing: {description}")
-                
-                if action_type == "click":
-                    self.page.click(selector)
-                elif action_type == "fill":
-                    value = action["value"]
-                    # Replace placeholders with actual data
-                    for key, val in data.items():
-                        value = value.replace(f"${{{key}}}", val)
-                    self.page.fill(selector, value)
-                
-                self.page.wait_for_timeout(1000)  # Short delay between actions
-                
-            except Exception as e:
-                logger.error(f"Failed to execute action: {action}, error: {e}")
-                # In a real implementation, we'd have recovery logic here
-    
-    def send_email(self, instruction: str) -> None:
+        # The action lists are fixed, so skip Playwright's locator engine and
+        # drive the page over the raw CDP session: one round-trip per action.
+        # Resolved handles are cached per selector and invalidated whenever
+        # the page navigates, so repeated fills/clicks on the same field skip
+        # the DOM re-query
+        sel_cache: Dict[str, Any] = {}
+        # Action values are pre-converted {key} templates, so each fill is a
+        # single C-level format_map call
+        fill_data = defaultdict(str, data)
+        # In fast mode, the first batched step resolves every selector in one
+        # page-side pass; later steps dispatch on the node array by index
+        nodes_id: Optional[str] = None
+
+        def _invalidate(_frame) -> None:
+            # Cached handles and the pre-resolved node array are both stale
+            # after a navigation
+            nonlocal nodes_id
+            sel_cache.clear()
+            nodes_id = None
+
+        page.on("framenavigated", _invalidate)
+        try:
+            i = 0
+            while i < len(actions):
+                action = actions[i]
+                start = i
+                try:
+                    if action.kind == "fill":
+                        # Coalesce the run of consecutive fills into one
+                        # page-side call: N round-trips become one
+                        indexed = []
+                        while i < len(actions) and actions[i].kind == "fill":
+                            fill = actions[i]
+                            logger.info(f"Executing: {fill.description}")
+                            indexed.append([i, fill.value.format_map(fill_data)])
+                            i += 1
+                        if self.fast_mode:
+                            if nodes_id is None:
+                                nodes_id = await self._resolve_all(
+                                    cdp, [a.selector for a in actions]
+                                )
+                            batch = self._call_on_nodes(
+                                cdp, nodes_id, _FILL_BY_INDEX_JS, [{"value": indexed}]
+                            )
+                        else:
+                            pairs = [[actions[j].selector, v] for j, v in indexed]
+                            await self._resolve(page, pairs[0][0], sel_cache)
+                            batch = self._rpc_fill_all(cdp, pairs)
+                        await self._measure(page, "batched fill", batch)
+                    else:
+                        logger.info(f"Executing: {action.description}")
+                        if self.fast_mode:
+                            # Plain DOM click over the CDP session: no
+                            # hit-test, scroll, or stability wait
+                            if nodes_id is not None:
+                                click = self._call_on_nodes(
+                                    cdp, nodes_id, _CLICK_BY_INDEX_JS, [{"value": i}]
+                                )
+                            else:
+                                click = self._rpc_click(cdp, action.selector)
+                        else:
+                            handle = await self._resolve(page, action.selector, sel_cache)
+                            click = self._cdp_click(cdp, handle)
+                        await self._measure(page, action.description, click)
+                        i += 1
+
+                    # Instead of a flat sleep, wait until the next action's
+                    # target is visible, with a capped fallback on timeout
+                    if i < len(actions):
+                        try:
+                            await page.wait_for_selector(
+                                actions[i].selector, state="visible", timeout=2000
+                            )
+                        except Exception:
+                            await page.wait_for_timeout(500)
+
+                except Exception as e:
+                    logger.error(f"Failed to execute action: {action}, error: {e}")
+                    if i == start:
+                        i += 1  # Skip the failed action rather than retry forever
+                    # In a real implementation, we'd have recovery logic here
+        finally:
+            # send_emails reuses one page across many action lists, so the
+            # invalidation hook must not accumulate per call
+            page.remove_listener("framenavigated", _invalidate)
+
+    async def _compose_email(self, page: Page, cdp, email_data: EmailInstruction) -> None:
+        """Analyze the UI and execute the compose/send actions on page"""
+        # Serialize the DOM only when the analyzer will actually use it;
+        # the mock never does, which saves a full-page CDP round-trip
+        html = await page.content() if self.llm.needs_html else None
+
+        # Generate actions based on UI analysis
+        actions = self.llm.analyze_ui_and_generate_actions(
+            f"Send email using {email_data.service.value}", html
+        )
+
+        # Prepare data for action execution
+        data = {
+            "recipient": email_data.recipient,
+            "subject": email_data.subject,
+            "body": email_data.body
+        }
+
+        # Execute the actions
+        await self.execute_actions(page, cdp, actions, data)
+
+        logger.info("Email sent successfully!")
+
+    async def send_email(self, instruction: str) -> None:
         """Main method to send email based on natural language instruction"""
+        context = await self.new_session()
+        page = await context.new_page()
+        page.on("requestfinished", self._record_request)
+        cdp = await context.new_cdp_session(page)
         try:
             # Parse the instruction
             email_data = self.llm.parse_email_instruction(instruction)
             logger.info(f"Parsed email data: {email_data}")
-            
+
             # Navigate to the service
-            self.navigate_to_service(email_data.service)
-            
+            await self.navigate_to_service(page, email_data.service)
+
             # Mock authentication
-            self.mock_authentication(email_data.service)
-            
-            # Get HTML for UI analysis
-            html = self.page.content()
-            
-            # Generate actions based on UI analysis
-            actions = self.llm.analyze_ui_and_generate_actions(
-                html, f"Send email using {email_data.service.value}"
-            )
-            
-            # Prepare data for action execution
-            data = {
-                "recipient": email_data.recipient,
-                "subject": email_data.subject,
-                "body": email_data.body
-            }
-            
-            # Execute the actions
-            self.execute_actions(actions, data)
-            
-            logger.info("Email sent successfully!")
-            
+            await self.mock_authentication(page, email_data.service)
+
+            # Compose and send
+            await self._compose_email(page, cdp, email_data)
+
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
         finally:
-            # Close browser
-            self.page.wait_for_timeout(3000)  # Wait to see the result
-            self.browser.close()
-            self.playwright.stop()
+            # Close only this task's context; the browser is shared
+            await context.close()
+
+    async def send_emails(self, instructions: List[str]) -> None:
+        """Send a batch of emails as a pipeline over one long-lived page
+
+        Instructions are grouped by service so consecutive same-service
+        emails reuse the already-navigated, already-authenticated page;
+        navigation and auth are paid once per service, not per email.
+        """
+        parsed = sorted(
+            (self.llm.parse_email_instruction(i) for i in instructions),
+            key=lambda e: e.service.value,
+        )
+        context = await self.new_session()
+        page = await context.new_page()
+        page.on("requestfinished", self._record_request)
+        cdp = await context.new_cdp_session(page)
+        current_service = None
+        try:
+            for email_data in parsed:
+                logger.info(f"Parsed email data: {email_data}")
+                try:
+                    if email_data.service is not current_service:
+                        await self.navigate_to_service(page, email_data.service)
+                        await self.mock_authentication(page, email_data.service)
+                        current_service = email_data.service
+                    await self._compose_email(page, cdp, email_data)
+                except Exception as e:
+                    logger.error(f"Failed to send email: {e}")
+        finally:
+            # Close only this batch's context; the browser is shared
+            await context.close()
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Shut down the shared browser and Playwright driver"""
+        # Report latency aggregates collected during the run
+        for name, samples in sorted(cls._stats.items()):
+            logger.info(
+                f"Timing {name}: n={len(samples)} "
+                f"avg={sum(samples) / len(samples):.1f}ms max={max(samples):.1f}ms"
+            )
+        cls._stats.clear()
+
+        # The only place the browser itself is ever closed; send_email only
+        # closes its own context
+        if cls._browser is not None:
+            await cls._browser.close()
+            cls._browser = None
+        if cls._playwright is not None:
+            await cls._playwright.stop()
+            cls._playwright = None
 
 class AutomationAPI:
     """FastAPI endpoint for the automation agent (conceptual)"""
-    
-    def __init__(self):
-        self.agent = WebAutomationAgent()
-    
-    def send_email_endpoint(self, instruction: str) -> Dict:
+
+    def __init__(self, agent: WebAutomationAgent):
+        self.agent = agent
+
+    async def send_email_endpoint(self, instruction: str) -> Dict:
         """Endpoint to send email based on instruction"""
         try:
-            self.agent.send_email(instruction)
+            await self.agent.send_email(instruction)
             return {"status": "success", "message": "Email sent successfully"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
-    
-    def run_cli(self):
+
+    async def run_cli(self):
         """Simple CLI interface"""
         print("Humaein Web Automation Agent")
         print("Enter your email instruction (e.g., 'Send an email to test@example.com about the meeting using Gmail'):")
-        
+
         instruction = input("> ")
-        self.send_email_endpoint(instruction)
+        await self.send_email_endpoint(instruction)
 
 # Main execution
-if __name__ == "__main__":
+async def main() -> None:
+    # Set up logging only on the executable path
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
     # Example usage
-    agent = WebAutomationAgent()
-    
+    agent = await WebAutomationAgent.setup()
+
     # Test with different instructions
     instructions = [
         "Send an email to colleague@company.com about the project update using Gmail",
         "Send an email to friend@example.com about our weekend plans using Outlook"
     ]
-    
+
+    # Pipeline same-service instructions over one page each; services still
+    # run concurrently with a bounded time budget per batch
+    batches: Dict[EmailService, List[str]] = defaultdict(list)
     for instruction in instructions:
-        print(f"\nProcessing: {instruction}")
-        agent.send_email(instruction)
-    
+        batches[agent.llm.parse_email_instruction(instruction).service].append(instruction)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for batch in batches.values():
+                tg.create_task(
+                    asyncio.wait_for(
+                        agent.send_emails(batch), timeout=_EMAIL_TIMEOUT * len(batch)
+                    )
+                )
+    except* Exception as eg:
+        for exc in eg.exceptions:
+            logger.error(f"Email task failed: {exc!r}")
+    finally:
+        await WebAutomationAgent.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())